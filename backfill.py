@@ -0,0 +1,212 @@
+"""Re-extract interest rate fields from the stored full_text of every snapshot.
+
+Run this after fixing a pattern in FIELD_MAPPING / extract_fields so that
+historical rows pick up the corrected values:
+
+    python backfill.py                # re-extract all rows
+    python backfill.py --dry-run      # only print what would change
+    python backfill.py --restart      # discard an interrupted run's checkpoint
+
+A checkpoint is only kept while a run is incomplete: an interrupted run
+resumes after the last committed chunk, and a run that reaches the end
+clears the checkpoint so the next run starts from the first row again.
+"""
+import argparse
+import logging
+import os
+import sqlite3
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from extraction import extract_fields
+
+logger = logging.getLogger(__name__)
+
+# extract_fields() field name -> interest_rates column
+FIELD_COLUMNS = {
+    'sollzinssatz': 'rate',
+    'effektiver_jahreszins': 'effektiver_jahreszins',
+    'nettokreditbetrag': 'nettokreditbetrag',
+    'vertragslaufzeit': 'vertragslaufzeit',
+    'gesamtbetrag': 'gesamtbetrag',
+    'monatliche_rate': 'monatliche_rate'
+}
+
+CHECKPOINT_NAME = 'interest_rates'
+
+
+def init_checkpoint(conn):
+    """Create the checkpoint table used to resume an interrupted backfill"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS backfill_checkpoint (
+            name TEXT PRIMARY KEY,
+            last_id INTEGER
+        )
+    ''')
+    conn.commit()
+
+
+def load_checkpoint(conn):
+    row = conn.execute('SELECT last_id FROM backfill_checkpoint WHERE name = ?', (CHECKPOINT_NAME,)).fetchone()
+    return row[0] if row else 0
+
+
+def save_checkpoint(conn, last_id):
+    conn.execute('INSERT OR REPLACE INTO backfill_checkpoint (name, last_id) VALUES (?, ?)', (CHECKPOINT_NAME, last_id))
+
+
+def clear_checkpoint(conn):
+    conn.execute('DELETE FROM backfill_checkpoint WHERE name = ?', (CHECKPOINT_NAME,))
+
+
+def iter_chunks(conn, start_id, chunk_size):
+    """Stream interest_rates rows in id order, chunk_size rows at a time"""
+    columns = ', '.join(FIELD_COLUMNS.values())
+    last_id = start_id
+    while True:
+        rows = conn.execute(f'''
+            SELECT id, bank_name, full_text, {columns}
+            FROM interest_rates
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        ''', (last_id, chunk_size)).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield rows
+
+
+def process_chunk(rows):
+    """Re-extract a chunk of rows; runs in a worker process
+
+    Returns the id of the last row in the chunk, the rows whose fields
+    changed as ``(id, bank_name, {column: (old, new)})`` and the number of
+    rows that could not be parsed.
+    """
+    changes = []
+    failed = 0
+    for row in rows:
+        row_id, bank_name, full_text = row[:3]
+        old_values = dict(zip(FIELD_COLUMNS.values(), row[3:]))
+        if not full_text:
+            continue
+        try:
+            fields = extract_fields(bank_name, full_text)
+        except Exception:
+            failed += 1
+            continue
+
+        diff = {}
+        for field, column in FIELD_COLUMNS.items():
+            old, new = old_values[column], fields.get(field)
+            # SQLite column affinity may turn '84' into 84, so compare as text
+            if (None if old is None else str(old)) != (None if new is None else str(new)):
+                diff[column] = (old, new)
+        if diff:
+            changes.append((row_id, bank_name, diff))
+    return rows[-1][0], changes, failed
+
+
+def apply_changes(conn, changes, last_id, dry_run):
+    """Write one chunk's changes and advance the checkpoint in a single transaction"""
+    if dry_run:
+        return
+    with conn:
+        for row_id, _, diff in changes:
+            assignments = ', '.join(f'{column} = ?' for column in diff)
+            values = [new for _, new in diff.values()]
+            conn.execute(f'UPDATE interest_rates SET {assignments} WHERE id = ?', values + [row_id])
+        save_checkpoint(conn, last_id)
+
+
+def run_backfill(db_path='austrian_banks.db', chunk_size=1000, workers=None, dry_run=False, restart=False, max_examples=3):
+    """Re-extract all rows and return a summary of the changes
+
+    Resumes after the checkpoint of an interrupted run unless ``restart`` is
+    set. The checkpoint is cleared once every row has been processed.
+    """
+    if chunk_size < 1 or (workers is not None and workers < 1):
+        # LIMIT 0 would scan nothing and then clear an interrupted run's checkpoint
+        raise ValueError("chunk_size and workers must be at least 1")
+    conn = sqlite3.connect(db_path)
+    try:
+        init_checkpoint(conn)
+        if restart and not dry_run:
+            with conn:
+                clear_checkpoint(conn)
+        start_id = 0 if restart else load_checkpoint(conn)
+        if start_id:
+            logger.warning(f"Resuming interrupted backfill after id {start_id}; use --restart to start from the first row")
+        else:
+            logger.info("Starting backfill from the first row")
+
+        workers = workers or os.cpu_count() or 1
+        summary = {'rows': 0, 'changed_rows': 0, 'failed': 0, 'fields': Counter(), 'examples': {}}
+
+        def collect(future, rows_in_chunk):
+            last_id, changes, failed = future.result()
+            apply_changes(conn, changes, last_id, dry_run)
+            summary['rows'] += rows_in_chunk
+            summary['changed_rows'] += len(changes)
+            summary['failed'] += failed
+            for row_id, bank_name, diff in changes:
+                for column, (old, new) in diff.items():
+                    summary['fields'][(bank_name, column)] += 1
+                    examples = summary['examples'].setdefault((bank_name, column), [])
+                    if len(examples) < max_examples:
+                        examples.append((row_id, old, new))
+            logger.info(f"Processed up to id {last_id}: {summary['rows']} rows, {summary['changed_rows']} changed")
+
+        # Keep a bounded number of chunks in flight so memory stays flat, and
+        # collect them in submission order so the checkpoint only moves forward.
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for rows in iter_chunks(conn, start_id, chunk_size):
+                pending.append((executor.submit(process_chunk, rows), len(rows)))
+                if len(pending) >= workers * 2:
+                    collect(*pending.popleft())
+            while pending:
+                collect(*pending.popleft())
+
+        if not dry_run:
+            with conn:
+                clear_checkpoint(conn)
+        return summary
+    finally:
+        conn.close()
+
+
+def print_summary(summary, dry_run=False):
+    """Print per bank and field how many values changed, with a few examples"""
+    verb = 'would change' if dry_run else 'changed'
+    print(f"\nScanned {summary['rows']} rows, {summary['changed_rows']} {verb}, {summary['failed']} could not be parsed")
+    for (bank_name, column), count in sorted(summary['fields'].items()):
+        print(f"\n{bank_name}.{column}: {count} rows {verb}")
+        for row_id, old, new in summary['examples'][(bank_name, column)]:
+            print(f"  id {row_id}: {old!r} -> {new!r}")
+
+
+def positive_int(value):
+    """argparse type for options that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-extract interest rate fields from stored full_text')
+    parser.add_argument('--db', default='austrian_banks.db', help='SQLite database path')
+    parser.add_argument('--chunk-size', type=positive_int, default=1000, help='rows per chunk and per transaction')
+    parser.add_argument('--workers', type=positive_int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='print the diff without writing it')
+    parser.add_argument('--restart', action='store_true', help='discard the checkpoint of an interrupted run and start from the first row')
+    args = parser.parse_args()
+
+    summary = run_backfill(args.db, args.chunk_size, args.workers, args.dry_run, args.restart)
+    print_summary(summary, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
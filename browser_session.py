@@ -0,0 +1,192 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserSessionManager:
+    """Serve scrapes from tabs inside one shared browser process.
+
+    Each scrape gets a fresh tab that is closed afterwards, with cookies,
+    cache and all storage of the tab's origin cleared so one bank never sees
+    another bank's state. The memory of the browser process tree (summed
+    PSS, so shared pages are not counted once per process) is checked after
+    every tab. Once it grows past ``max_memory_mb`` or the browser has served
+    ``max_pages`` tabs, the browser is closed and the next tab starts a new
+    one.
+    """
+
+    def __init__(self, driver_factory, max_memory_mb=None, max_pages=None):
+        self.driver_factory = driver_factory
+        self.max_memory_mb = max_memory_mb if max_memory_mb is not None else int(os.getenv('BROWSER_MAX_MEMORY_MB', '800'))
+        self.max_pages = max_pages if max_pages is not None else int(os.getenv('BROWSER_MAX_PAGES', '50'))
+        self.driver = None
+        self.pages_served = 0
+        self.peak_memory_mb = 0
+        self._base_handle = None
+        # A WebDriver session only drives one tab at a time, so tabs are
+        # handed out one after another even when callers use threads.
+        self._lock = threading.RLock()
+
+    def start(self):
+        """Start the browser if it is not running yet"""
+        with self._lock:
+            if self.driver is None:
+                logger.info("Starting shared browser process")
+                self.driver = self.driver_factory()
+                self._base_handle = self.driver.current_window_handle
+                self.pages_served = 0
+            return self.driver
+
+    def close(self):
+        """Quit the browser process"""
+        with self._lock:
+            if self.driver is not None:
+                logger.info(f"Closing shared browser after {self.pages_served} pages (peak memory {self.peak_memory_mb:.0f} MB)")
+                try:
+                    self.driver.quit()
+                except Exception as e:
+                    logger.warning(f"Error while quitting browser: {str(e)}")
+                self.driver = None
+                self._base_handle = None
+
+    @contextmanager
+    def tab(self):
+        """Yield the driver switched to a fresh tab, cleaned up on exit"""
+        with self._lock:
+            driver = self._open_tab()
+            try:
+                yield driver
+            finally:
+                self._release_tab()
+
+    def _open_tab(self):
+        """Switch to a new tab, starting a fresh browser once if the current one is dead"""
+        driver = self.start()
+        try:
+            driver.switch_to.new_window('tab')
+            return driver
+        except Exception as e:
+            # Most likely Chrome died between tabs (e.g. an OOM kill); drop the
+            # dead session so neither this call nor later ones keep reusing it.
+            logger.warning(f"Failed to open tab, restarting browser: {str(e)}")
+            self.close()
+
+        driver = self.start()
+        try:
+            driver.switch_to.new_window('tab')
+        except Exception:
+            self.close()
+            raise
+        return driver
+
+    def _release_tab(self):
+        """Clear browsing state, close the current tab and recycle if needed
+
+        Recycling only closes the browser; the next tab() starts a new one, so
+        no browser is launched that never serves a page.
+        """
+        try:
+            self.clear_state()
+            self.driver.close()
+            self.driver.switch_to.window(self._base_handle)
+        except Exception as e:
+            # A tab we cannot close usually means a crashed renderer or
+            # browser; start over rather than reuse a broken session.
+            logger.warning(f"Failed to release tab, recycling browser: {str(e)}")
+            self.close()
+            return
+
+        self.pages_served += 1
+        memory_mb = self.get_memory_mb()
+        if memory_mb is not None:
+            self.peak_memory_mb = max(self.peak_memory_mb, memory_mb)
+            logger.info(f"Browser memory after {self.pages_served} pages: {memory_mb:.0f} MB")
+
+        if memory_mb is not None and memory_mb > self.max_memory_mb:
+            logger.info(f"Browser memory {memory_mb:.0f} MB exceeds {self.max_memory_mb} MB, recycling")
+            self.close()
+        elif self.pages_served >= self.max_pages:
+            logger.info(f"Browser served {self.pages_served} pages, recycling")
+            self.close()
+
+    def clear_state(self):
+        """Remove cookies, cache and all storage left behind by the current tab"""
+        url = urlparse(self.driver.current_url)
+        if url.scheme in ('http', 'https'):
+            # Covers local/session storage, IndexedDB, service workers and Cache Storage
+            try:
+                self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                    'origin': f'{url.scheme}://{url.netloc}',
+                    'storageTypes': 'all'
+                })
+            except Exception as e:
+                logger.warning(f"Failed to clear storage for {url.netloc}: {str(e)}")
+        try:
+            self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        except Exception as e:
+            logger.warning(f"Failed to clear cookies and cache via CDP, deleting cookies instead: {str(e)}")
+            self.driver.delete_all_cookies()
+
+    def get_memory_mb(self):
+        """Return the memory (PSS) of the browser and its child processes in MB"""
+        pid = getattr(self.driver, 'browser_pid', None)
+        if pid is None:
+            return None
+        memory = _process_tree_memory(pid)
+        return memory / (1024 * 1024) if memory is not None else None
+
+
+def _process_tree_memory(root_pid):
+    """Sum memory in bytes over a process and all its descendants using /proc
+
+    Uses PSS, which splits shared pages between the processes that map them.
+    Plain RSS would count the Chrome binary, shared libraries and shared
+    memory once per process. Falls back to RSS where smaps_rollup is missing.
+    """
+    if not os.path.isdir('/proc'):
+        return None
+
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, so split after its closing paren
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        memory = _process_pss(pid)
+        if memory is None:
+            try:
+                with open(f'/proc/{pid}/statm') as f:
+                    memory = int(f.read().split()[1]) * page_size
+            except (OSError, IndexError, ValueError):
+                continue
+        total += memory
+        pending.extend(children.get(pid, []))
+    return total
+
+
+def _process_pss(pid):
+    """Return the PSS of a single process in bytes, or None if unavailable"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, IndexError, ValueError):
+        pass
+    return None
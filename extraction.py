@@ -0,0 +1,78 @@
+import ast
+import re
+
+# Mapping table for field names by bank
+FIELD_MAPPING = {
+    'raiffeisen': {
+        'sollzinssatz': 'Sollzinssatz',
+        'effektiver_jahreszins': 'effektiver Jahreszins',
+        'nettokreditbetrag': 'Nettokreditbetrag',
+        'vertragslaufzeit': 'Vertragslaufzeit',
+        'gesamtbetrag': 'Gesamtbetrag',
+        'monatliche_rate': 'monatliche Rate'
+    },
+    'bawag': {
+        'sollzinssatz': 'Nominalzinssatz in Höhe von',
+        'effektiver_jahreszins': 'Effektivzinssatz',
+        'nettokreditbetrag': 'Nettodarlehensbetrag von',
+        'vertragslaufzeit': 'Laufzeit von',
+        'gesamtbetrag': 'Gesamtrückzahlung',
+        'monatliche_rate': 'Monatliche Rate'
+    },
+    'bank99': {
+        'sollzinssatz': r'Sollzinssatz\s*([\d,]+)\s*%\s*p\.a\.\s*fix',
+        'effektiver_jahreszins': r'effektiver Jahreszins\s*([\d,]+)\s*%\s*p\.a\.',
+        'nettokreditbetrag': r'Kreditbetrag von €\s*(\d{1,3}(?:\.\d{3})*)',
+        'vertragslaufzeit': r'Laufzeit von\s*([\d]+)\s*Monaten',
+        'gesamtbetrag': r'Gesamtbetrag von €\s*(\d{1,3}(?:\.\d{3})*)',
+        'monatliche_rate': r'€\s*([\d,.]+)\s*pro Monat'
+    },
+    'erste': {
+        'sollzinssatz': 'interestRate',
+        'effektiver_jahreszins': 'effectiveInterestRate',
+        'nettokreditbetrag': 'startAmount',
+        'vertragslaufzeit': 'startDuration',
+        'gesamtbetrag': None,
+        'monatliche_rate': 'installment'
+    }
+}
+
+def extract_fields(bank_name, text):
+    """Extract the representative example fields from a bank's scraped text
+
+    Returns a dict keyed by the FIELD_MAPPING field names. For Erste, ``text``
+    is the API response, either as a dict or as its stored ``str()`` form.
+    """
+    mapping = FIELD_MAPPING[bank_name]
+
+    if bank_name == 'raiffeisen':
+        patterns = {
+            'sollzinssatz': rf"{mapping['sollzinssatz']}: ([\d,]+ %)",
+            'effektiver_jahreszins': rf"{mapping['effektiver_jahreszins']}: ([\d,]+ %)",
+            'nettokreditbetrag': rf"{mapping['nettokreditbetrag']}: ([\d,.]+ Euro)",
+            'vertragslaufzeit': rf"{mapping['vertragslaufzeit']}: ([\d]+ Monate)",
+            'gesamtbetrag': rf"{mapping['gesamtbetrag']}: ([\d,.]+ Euro)",
+            'monatliche_rate': rf"{mapping['monatliche_rate']}: ([\d,.]+ Euro)"
+        }
+    elif bank_name == 'bawag':
+        patterns = {
+            'sollzinssatz': rf"{mapping['sollzinssatz']}\s*([\d,]+%)\s*variabel",
+            'effektiver_jahreszins': rf"{mapping['effektiver_jahreszins']}\s*([\d,]+%)\s*p\.a\.",
+            'nettokreditbetrag': rf"{mapping['nettokreditbetrag']}\s*([\d,.]+)\s*Euro",
+            'vertragslaufzeit': rf"{mapping['vertragslaufzeit']}\s*([\d]+)\s*Monate",
+            'gesamtbetrag': rf"{mapping['gesamtbetrag']}\s*([\d,.]+)\s*Euro",
+            'monatliche_rate': rf"{mapping['monatliche_rate']}\s*([\d,.]+)\s*Euro"
+        }
+    elif bank_name == 'bank99':
+        patterns = mapping
+    elif bank_name == 'erste':
+        data = text if isinstance(text, dict) else ast.literal_eval(text)
+        return {field: data.get(key) if key else None for field, key in mapping.items()}
+    else:
+        raise ValueError(f"No extraction rules for bank: {bank_name}")
+
+    result = {}
+    for field, pattern in patterns.items():
+        match = re.search(pattern, text)
+        result[field] = match.group(1) if match else None
+    return result
@@ -12,8 +12,9 @@ import time
 from fake_useragent import UserAgent
 import os
 from dotenv import load_dotenv
-import re
 import platform
+from browser_session import BrowserSessionManager
+from extraction import FIELD_MAPPING, extract_fields
 
 # Load environment variables
 load_dotenv()
@@ -50,41 +51,7 @@ class AustrianBankScraper:
             }
         }
         
-        # Mapping table for field names by bank
-        self.field_mapping = {
-            'raiffeisen': {
-                'sollzinssatz': 'Sollzinssatz',
-                'effektiver_jahreszins': 'effektiver Jahreszins',
-                'nettokreditbetrag': 'Nettokreditbetrag',
-                'vertragslaufzeit': 'Vertragslaufzeit',
-                'gesamtbetrag': 'Gesamtbetrag',
-                'monatliche_rate': 'monatliche Rate'
-            },
-            'bawag': {
-                'sollzinssatz': 'Nominalzinssatz in Höhe von',
-                'effektiver_jahreszins': 'Effektivzinssatz',
-                'nettokreditbetrag': 'Nettodarlehensbetrag von',
-                'vertragslaufzeit': 'Laufzeit von',
-                'gesamtbetrag': 'Gesamtrückzahlung',
-                'monatliche_rate': 'Monatliche Rate'
-            },
-            'bank99': {
-                'sollzinssatz': r'Sollzinssatz\s*([\d,]+)\s*%\s*p\.a\.\s*fix',
-                'effektiver_jahreszins': r'effektiver Jahreszins\s*([\d,]+)\s*%\s*p\.a\.',
-                'nettokreditbetrag': r'Kreditbetrag von €\s*(\d{1,3}(?:\.\d{3})*)',
-                'vertragslaufzeit': r'Laufzeit von\s*([\d]+)\s*Monaten',
-                'gesamtbetrag': r'Gesamtbetrag von €\s*(\d{1,3}(?:\.\d{3})*)',
-                'monatliche_rate': r'€\s*([\d,.]+)\s*pro Monat'
-            },
-            'erste': {
-                'sollzinssatz': 'interestRate',
-                'effektiver_jahreszins': 'effectiveInterestRate',
-                'nettokreditbetrag': 'startAmount',
-                'vertragslaufzeit': 'startDuration',
-                'gesamtbetrag': None,
-                'monatliche_rate': 'installment'
-            }
-        }
+        self.field_mapping = FIELD_MAPPING
         
         # Switch to enable/disable scraping for each bank
         self.enable_scraping = {
@@ -94,12 +61,29 @@ class AustrianBankScraper:
             'erste': True
         }
         
+        # Banks scraped through the browser; the others are read from an API
+        self.selenium_banks = {'raiffeisen', 'bawag', 'bank99'}
+        
         self.ua = UserAgent()
         self.setup_selenium()
         self.init_database()
 
     def setup_selenium(self):
-        """Set up Selenium WebDriver with appropriate options for ARM64"""
+        """Set up a shared browser session; each bank is scraped in its own tab"""
+        self.browser = BrowserSessionManager(self.create_driver)
+        self.browser.start()
+
+    @property
+    def driver(self):
+        return self.browser.driver
+
+    @property
+    def wait(self):
+        # Rebuilt on access because the browser may have been recycled
+        return WebDriverWait(self.browser.driver, 10)
+
+    def create_driver(self):
+        """Create a Selenium WebDriver with appropriate options for ARM64"""
         options = uc.ChromeOptions()
         options.add_argument('--headless')
         options.add_argument('--no-sandbox')
@@ -125,7 +109,7 @@ class AustrianBankScraper:
         # Initialize the driver with specific version for ARM64
         try:
             logger.info("Initializing Chrome driver for ARM64...")
-            self.driver = uc.Chrome(
+            driver = uc.Chrome(
                 options=options,
                 version_main=None,  # Let it auto-detect the version
                 driver_executable_path=None,  # Let it download the appropriate driver
@@ -135,7 +119,7 @@ class AustrianBankScraper:
                 use_subprocess=True  # Use subprocess for better compatibility
             )
             logger.info("Chrome driver initialized successfully")
-            self.wait = WebDriverWait(self.driver, 10)
+            return driver
         except Exception as e:
             logger.error(f"Failed to initialize Chrome driver: {str(e)}")
             # Debug: Check if ChromeDriver was downloaded
@@ -186,13 +170,25 @@ class AustrianBankScraper:
                 time.sleep(2 ** attempt)  # Exponential backoff
 
     def scrape_interest_rates(self, bank_name):
-        """Scrape interest rates for a specific bank"""
+        """Scrape interest rates for a specific bank, in a fresh browser tab if it needs one"""
+        if bank_name not in self.selenium_banks:
+            self._scrape_interest_rates(bank_name)
+            return
+        try:
+            with self.browser.tab():
+                self._scrape_interest_rates(bank_name)
+        except Exception as e:
+            # e.g. the browser could not be (re)started; move on to the next bank
+            logger.error(f"Could not open a browser tab for {bank_name}: {str(e)}")
+
+    def _scrape_interest_rates(self, bank_name):
         try:
             url = self.banks[bank_name]['interest_rates_url']
             logger.info(f"Scraping interest rates for {bank_name}")
             
-            self.driver.get(url)
-            time.sleep(5)  # Add a delay to let the page load completely
+            if bank_name in self.selenium_banks:
+                self.driver.get(url)
+                time.sleep(5)  # Add a delay to let the page load completely
             
             if bank_name == 'raiffeisen':
                 # Extract interest rate and fees from the specified element
@@ -226,16 +222,10 @@ class AustrianBankScraper:
                     logger.info(f"Extracted text: {text}")
                     
                     # Parse the text to extract specific fields using the mapping
-                    mapping = self.field_mapping[bank_name]
-                    sollzinssatz = re.search(rf"{mapping['sollzinssatz']}: ([\d,]+ %)", text).group(1) if re.search(rf"{mapping['sollzinssatz']}: ([\d,]+ %)", text) else None
-                    effektiver_jahreszins = re.search(rf"{mapping['effektiver_jahreszins']}: ([\d,]+ %)", text).group(1) if re.search(rf"{mapping['effektiver_jahreszins']}: ([\d,]+ %)", text) else None
-                    nettokreditbetrag = re.search(rf"{mapping['nettokreditbetrag']}: ([\d,.]+ Euro)", text).group(1) if re.search(rf"{mapping['nettokreditbetrag']}: ([\d,.]+ Euro)", text) else None
-                    vertragslaufzeit = re.search(rf"{mapping['vertragslaufzeit']}: ([\d]+ Monate)", text).group(1) if re.search(rf"{mapping['vertragslaufzeit']}: ([\d]+ Monate)", text) else None
-                    gesamtbetrag = re.search(rf"{mapping['gesamtbetrag']}: ([\d,.]+ Euro)", text).group(1) if re.search(rf"{mapping['gesamtbetrag']}: ([\d,.]+ Euro)", text) else None
-                    monatliche_rate = re.search(rf"{mapping['monatliche_rate']}: ([\d,.]+ Euro)", text).group(1) if re.search(rf"{mapping['monatliche_rate']}: ([\d,.]+ Euro)", text) else None
+                    fields = extract_fields(bank_name, text)
                     
                     # Store the extracted fields in the database
-                    self.store_interest_rate(bank_name, 'Representative Example', sollzinssatz, 'EUR', url, nettokreditbetrag, gesamtbetrag, vertragslaufzeit, effektiver_jahreszins, monatliche_rate, text)
+                    self.store_interest_rate(bank_name, 'Representative Example', fields['sollzinssatz'], 'EUR', url, fields['nettokreditbetrag'], fields['gesamtbetrag'], fields['vertragslaufzeit'], fields['effektiver_jahreszins'], fields['monatliche_rate'], text)
                 
                 except Exception as e:
                     logger.error(f"Error processing Raiffeisen data: {str(e)}")
@@ -249,16 +239,10 @@ class AustrianBankScraper:
                 text = element.text
                 
                 # Parse the text to extract specific fields using the mapping
-                mapping = self.field_mapping[bank_name]
-                sollzinssatz = re.search(rf"{mapping['sollzinssatz']}\s*([\d,]+%)\s*variabel", text).group(1) if re.search(rf"{mapping['sollzinssatz']}\s*([\d,]+%)\s*variabel", text) else None
-                effektiver_jahreszins = re.search(rf"{mapping['effektiver_jahreszins']}\s*([\d,]+%)\s*p\.a\.", text).group(1) if re.search(rf"{mapping['effektiver_jahreszins']}\s*([\d,]+%)\s*p\.a\.", text) else None
-                nettokreditbetrag = re.search(rf"{mapping['nettokreditbetrag']}\s*([\d,.]+)\s*Euro", text).group(1) if re.search(rf"{mapping['nettokreditbetrag']}\s*([\d,.]+)\s*Euro", text) else None
-                vertragslaufzeit = re.search(rf"{mapping['vertragslaufzeit']}\s*([\d]+)\s*Monate", text).group(1) if re.search(rf"{mapping['vertragslaufzeit']}\s*([\d]+)\s*Monate", text) else None
-                gesamtbetrag = re.search(rf"{mapping['gesamtbetrag']}\s*([\d,.]+)\s*Euro", text).group(1) if re.search(rf"{mapping['gesamtbetrag']}\s*([\d,.]+)\s*Euro", text) else None
-                monatliche_rate = re.search(rf"{mapping['monatliche_rate']}\s*([\d,.]+)\s*Euro", text).group(1) if re.search(rf"{mapping['monatliche_rate']}\s*([\d,.]+)\s*Euro", text) else None
+                fields = extract_fields(bank_name, text)
                 
                 # Store the extracted fields in the database
-                self.store_interest_rate(bank_name, 'Representative Example', sollzinssatz, 'EUR', url, nettokreditbetrag, gesamtbetrag, vertragslaufzeit, effektiver_jahreszins, monatliche_rate, text)
+                self.store_interest_rate(bank_name, 'Representative Example', fields['sollzinssatz'], 'EUR', url, fields['nettokreditbetrag'], fields['gesamtbetrag'], fields['vertragslaufzeit'], fields['effektiver_jahreszins'], fields['monatliche_rate'], text)
             
             elif bank_name == 'bank99':
                 # Wait for the specific element to be present
@@ -270,16 +254,10 @@ class AustrianBankScraper:
                 logger.info(f"Extracted text: {text}")
                 
                 # Parse the text to extract specific fields using the mapping
-                mapping = self.field_mapping[bank_name]
-                sollzinssatz = re.search(mapping['sollzinssatz'], text).group(1) if re.search(mapping['sollzinssatz'], text) else None
-                effektiver_jahreszins = re.search(mapping['effektiver_jahreszins'], text).group(1) if re.search(mapping['effektiver_jahreszins'], text) else None
-                nettokreditbetrag = re.search(mapping['nettokreditbetrag'], text).group(1) if re.search(mapping['nettokreditbetrag'], text) else None
-                vertragslaufzeit = re.search(mapping['vertragslaufzeit'], text).group(1) if re.search(mapping['vertragslaufzeit'], text) else None
-                gesamtbetrag = re.search(mapping['gesamtbetrag'], text).group(1) if re.search(mapping['gesamtbetrag'], text) else None
-                monatliche_rate = re.search(mapping['monatliche_rate'], text).group(1) if re.search(mapping['monatliche_rate'], text) else None
+                fields = extract_fields(bank_name, text)
                 
                 # Store the extracted fields in the database
-                self.store_interest_rate(bank_name, 'Representative Example', sollzinssatz, 'EUR', url, nettokreditbetrag, gesamtbetrag, vertragslaufzeit, effektiver_jahreszins, monatliche_rate, text)
+                self.store_interest_rate(bank_name, 'Representative Example', fields['sollzinssatz'], 'EUR', url, fields['nettokreditbetrag'], fields['gesamtbetrag'], fields['vertragslaufzeit'], fields['effektiver_jahreszins'], fields['monatliche_rate'], text)
             
             elif bank_name == 'erste':
                 # Fetch JSON data directly from the API
@@ -290,25 +268,19 @@ class AustrianBankScraper:
                 response = requests.get(api_url, headers=headers, verify=False)
                 response.raise_for_status()
                 data = response.json()
-                mapping = self.field_mapping[bank_name]
-                sollzinssatz = data.get(mapping['sollzinssatz'])
-                effektiver_jahreszins = data.get(mapping['effektiver_jahreszins'])
-                nettokreditbetrag = data.get(mapping['nettokreditbetrag'])
-                vertragslaufzeit = data.get(mapping['vertragslaufzeit'])
-                gesamtbetrag = None
-                monatliche_rate = data.get(mapping['monatliche_rate'])
+                fields = extract_fields(bank_name, data)
                 # Store the extracted fields in the database
                 self.store_interest_rate(
                     bank_name,
                     'Representative Example',
-                    sollzinssatz,
+                    fields['sollzinssatz'],
                     'EUR',
                     api_url,
-                    nettokreditbetrag,
-                    gesamtbetrag,
-                    vertragslaufzeit,
-                    effektiver_jahreszins,
-                    monatliche_rate,
+                    fields['nettokreditbetrag'],
+                    fields['gesamtbetrag'],
+                    fields['vertragslaufzeit'],
+                    fields['effektiver_jahreszins'],
+                    fields['monatliche_rate'],
                     str(data)
                 )
             
@@ -514,7 +486,7 @@ class AustrianBankScraper:
         except Exception as e:
             logger.error(f"Error during scraping: {str(e)}")
         finally:
-            self.driver.quit()
+            self.browser.close()
 
 if __name__ == "__main__":
     scraper = AustrianBankScraper()
@@ -0,0 +1,134 @@
+import sqlite3
+
+import pytest
+
+import backfill
+
+RAIFFEISEN_TEXT = (
+    "Sollzinssatz: 6,5 %\neffektiver Jahreszins: 7,1 %\nNettokreditbetrag: 10.000 Euro\n"
+    "Vertragslaufzeit: 84 Monate\nGesamtbetrag: 12.000 Euro\nmonatliche Rate: 150,00 Euro"
+)
+BANK99_TEXT = (
+    "Sollzinssatz 5,9 % p.a. fix, effektiver Jahreszins 6,3 % p.a. Kreditbetrag von € 10.000 "
+    "Laufzeit von 60 Monaten Gesamtbetrag von € 11.500 € 190,5 pro Monat"
+)
+
+
+def create_db(path, rows):
+    """Create an interest_rates table with the scraper's schema and fill it"""
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE interest_rates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bank_name TEXT,
+            product_name TEXT,
+            rate TEXT,
+            currency TEXT,
+            date_scraped TIMESTAMP,
+            source_url TEXT,
+            nettokreditbetrag TEXT,
+            gesamtbetrag TEXT,
+            vertragslaufzeit INTEGER,
+            effektiver_jahreszins TEXT,
+            monatliche_rate TEXT,
+            full_text TEXT
+        )
+    ''')
+    conn.executemany('''
+        INSERT INTO interest_rates (bank_name, rate, nettokreditbetrag, gesamtbetrag, vertragslaufzeit, effektiver_jahreszins, monatliche_rate, full_text)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+
+
+def stale_rows(count):
+    """Raiffeisen rows whose stored fields are all missing"""
+    return [('raiffeisen', None, None, None, None, None, None, RAIFFEISEN_TEXT)] * count
+
+
+def read_rates(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute('SELECT rate FROM interest_rates ORDER BY id')]
+    finally:
+        conn.close()
+
+
+def read_checkpoint(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('SELECT name, last_id FROM backfill_checkpoint').fetchall()
+    finally:
+        conn.close()
+
+
+def test_process_chunk_diff():
+    # Rows are (id, bank_name, full_text, *FIELD_COLUMNS values)
+    columns = list(backfill.FIELD_COLUMNS.values())
+    assert columns == ['rate', 'effektiver_jahreszins', 'nettokreditbetrag', 'vertragslaufzeit', 'gesamtbetrag', 'monatliche_rate']
+    # Same values as the text yields; vertragslaufzeit was stored as INTEGER 60
+    unchanged = (1, 'bank99', BANK99_TEXT, '5,9', '6,3', '10.000', 60, '11.500', '190,5')
+    # Wrong rate and missing monthly rate
+    changed = (2, 'bank99', BANK99_TEXT, '9,9', '6,3', '10.000', 60, '11.500', None)
+    unparseable = (3, 'erste', 'not a dict {', None, None, None, None, None, None)
+    empty = (4, 'bank99', None, None, None, None, None, None, None)
+
+    last_id, changes, failed = backfill.process_chunk([unchanged, changed, unparseable, empty])
+
+    assert last_id == 4
+    assert failed == 1
+    assert changes == [(2, 'bank99', {'rate': ('9,9', '5,9'), 'monatliche_rate': (None, '190,5')})]
+
+
+def test_completed_run_clears_checkpoint(tmp_path):
+    db_path = str(tmp_path / 'banks.db')
+    create_db(db_path, stale_rows(25))
+
+    first = backfill.run_backfill(db_path, chunk_size=10, workers=2)
+    assert first['rows'] == 25
+    assert first['changed_rows'] == 25
+    assert read_rates(db_path) == ['6,5 %'] * 25
+    assert read_checkpoint(db_path) == []
+
+    second = backfill.run_backfill(db_path, chunk_size=10, workers=2)
+    assert second['rows'] == 25
+    assert second['changed_rows'] == 0
+
+
+def test_interrupted_run_resumes_after_last_chunk(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'banks.db')
+    create_db(db_path, stale_rows(25))
+
+    apply_changes = backfill.apply_changes
+    calls = []
+
+    def fail_on_second_chunk(*args):
+        calls.append(args)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        apply_changes(*args)
+
+    monkeypatch.setattr(backfill, 'apply_changes', fail_on_second_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        backfill.run_backfill(db_path, chunk_size=10, workers=1)
+    monkeypatch.undo()
+
+    assert read_checkpoint(db_path) == [(backfill.CHECKPOINT_NAME, 10)]
+    assert read_rates(db_path) == ['6,5 %'] * 10 + [None] * 15
+
+    resumed = backfill.run_backfill(db_path, chunk_size=10, workers=1)
+    assert resumed['rows'] == 15
+    assert resumed['changed_rows'] == 15
+    assert read_rates(db_path) == ['6,5 %'] * 25
+    assert read_checkpoint(db_path) == []
+
+
+@pytest.mark.parametrize('chunk_size, workers', [(0, None), (-1, None), (10, 0)])
+def test_rejects_non_positive_chunk_size_and_workers(tmp_path, chunk_size, workers):
+    db_path = str(tmp_path / 'banks.db')
+    create_db(db_path, stale_rows(5))
+
+    with pytest.raises(ValueError):
+        backfill.run_backfill(db_path, chunk_size=chunk_size, workers=workers)
+    assert read_rates(db_path) == [None] * 5
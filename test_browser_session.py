@@ -0,0 +1,148 @@
+import pytest
+
+from browser_session import BrowserSessionManager
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind):
+        if self.driver.dead:
+            raise RuntimeError('browser is gone')
+        self.driver.handles.append(len(self.driver.handles))
+        self.driver.current_window_handle = self.driver.handles[-1]
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """Just enough of a WebDriver to drive BrowserSessionManager without Chrome"""
+
+    current_url = 'https://bank.example/kredit'
+    dead = False
+
+    def __init__(self):
+        self.handles = [0]
+        self.current_window_handle = 0
+        self.switch_to = FakeSwitchTo(self)
+        self.cdp_commands = []
+        self.fail_close = False
+        self.quit_called = False
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_commands.append((cmd, params))
+
+    def delete_all_cookies(self):
+        pass
+
+    def close(self):
+        if self.fail_close:
+            raise RuntimeError('tab crashed')
+        self.handles.remove(self.current_window_handle)
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def drivers():
+    return []
+
+
+@pytest.fixture
+def make_manager(drivers, monkeypatch):
+    def factory():
+        driver = FakeDriver()
+        drivers.append(driver)
+        return driver
+
+    def make(memory_mb=100, **kwargs):
+        manager = BrowserSessionManager(factory, **kwargs)
+        monkeypatch.setattr(manager, 'get_memory_mb', lambda: memory_mb)
+        return manager
+
+    return make
+
+
+def test_tab_clears_state_and_returns_to_base_tab(make_manager, drivers):
+    manager = make_manager(max_memory_mb=1000, max_pages=10)
+    with manager.tab() as driver:
+        assert driver.current_window_handle != 0
+
+    assert driver.handles == [0]
+    assert driver.current_window_handle == 0
+    assert [cmd for cmd, _ in driver.cdp_commands] == [
+        'Storage.clearDataForOrigin', 'Network.clearBrowserCookies', 'Network.clearBrowserCache'
+    ]
+    assert driver.cdp_commands[0][1] == {'origin': 'https://bank.example', 'storageTypes': 'all'}
+    assert manager.pages_served == 1
+
+
+def test_recycles_after_max_pages(make_manager, drivers):
+    manager = make_manager(max_memory_mb=1000, max_pages=2)
+    for _ in range(4):
+        with manager.tab():
+            pass
+
+    # Recycling only closes the browser; no browser is started without a page to serve
+    assert len(drivers) == 2
+    assert all(driver.quit_called for driver in drivers)
+    assert manager.driver is None
+
+
+def test_recycles_when_memory_exceeds_limit(make_manager, drivers):
+    manager = make_manager(memory_mb=900, max_memory_mb=800, max_pages=50)
+    with manager.tab():
+        pass
+
+    assert drivers[0].quit_called
+    assert manager.driver is None
+    assert manager.peak_memory_mb == 900
+
+
+def test_closes_browser_when_tab_release_fails(make_manager, drivers):
+    manager = make_manager(max_memory_mb=1000, max_pages=50)
+    with manager.tab() as driver:
+        driver.fail_close = True
+
+    assert driver.quit_called
+    assert manager.driver is None
+
+
+def test_next_tab_relaunches_closed_browser(make_manager, drivers):
+    manager = make_manager(max_memory_mb=1000, max_pages=1)
+    with manager.tab():
+        pass
+    assert manager.driver is None
+
+    with manager.tab() as driver:
+        assert driver is drivers[1]
+    assert len(drivers) == 2
+
+
+def test_dead_browser_is_replaced_when_opening_tab(make_manager, drivers):
+    manager = make_manager(max_memory_mb=1000, max_pages=50)
+    manager.start()
+    drivers[0].dead = True
+
+    with manager.tab() as driver:
+        assert driver is drivers[1]
+    assert drivers[0].quit_called
+
+
+def test_open_tab_failure_drops_session_and_reraises(make_manager, drivers, monkeypatch):
+    manager = make_manager(max_memory_mb=1000, max_pages=50)
+    monkeypatch.setattr(FakeDriver, 'dead', True)
+
+    with pytest.raises(RuntimeError):
+        with manager.tab():
+            pass
+    assert manager.driver is None
+    assert len(drivers) == 2
+
+    # Once Chrome can open tabs again, the next call starts a fresh browser
+    monkeypatch.setattr(FakeDriver, 'dead', False)
+    with manager.tab() as driver:
+        assert driver is drivers[2]
@@ -6,6 +6,7 @@ import logging
 import time
 import os
 import re
+from browser_session import BrowserSessionManager
 
 # Set up logging
 logging.basicConfig(
@@ -46,6 +47,9 @@ def setup_selenium():
     wait = WebDriverWait(driver, 10)
     return driver, wait
 
+# Shared browser; every scraped page gets its own tab
+browser = BrowserSessionManager(lambda: setup_selenium()[0])
+
 def parse_erstebank_text(text):
     """Parse the Erste Bank representative calculation text for relevant fields."""
     mapping = {
@@ -65,8 +69,12 @@ def parse_erstebank_text(text):
     return result
 
 def scrape_page(url):
-    """Scrape the entire HTML content of the given URL using Selenium"""
-    driver, wait = setup_selenium()
+    """Scrape the entire HTML content of the given URL in a tab of the shared browser"""
+    with browser.tab() as driver:
+        return _scrape_page(driver, url)
+
+def _scrape_page(driver, url):
+    wait = WebDriverWait(driver, 10)
     try:
         logger.info(f"Accessing URL: {url}")
         driver.get(url)
@@ -113,12 +121,13 @@ def scrape_page(url):
         except:
             pass
         return None
-    finally:
-        driver.quit()
 
 def main():
     url = 'https://www.sparkasse.at/erstebank/privatkunden/wohnen-finanzieren/konsumfinanzierung/konsumkredit'
-    content = scrape_page(url)
+    try:
+        content = scrape_page(url)
+    finally:
+        browser.close()
     
     if content:
         print("\n--- Raw Extracted HTML ---\n")